@@ -9,26 +9,43 @@ __version__ = "1.0.0"
 __author__ = "Your Name"
 __email__ = "your.email@example.com"
 
-# Import main classes for easy access
-from agents.ollama_agent import OllamaStrandAgent
-from agents.specialized_agents import (
-    MathAgent,
-    ResearchAgent, 
-    CodeAgent,
-    AnalysisAgent,
-    CreativeAgent,
-    create_agent,
-    math_agent,
-    research_agent,
-    code_agent,
-    analysis_agent,
-    creative_agent
-)
-from config.ollama_config import ollama_config
-from tools.custom_tools import CUSTOM_TOOLS
+import importlib
+
+# Public names and the modules that define them. Modules are imported on
+# first attribute access (PEP 562), so importing the package stays cheap
+# until an agent is actually used.
+_LAZY_IMPORTS = {
+    "OllamaStrandAgent": "agents.ollama_agent",
+    "gather_chat": "agents.ollama_agent",
+    "MathAgent": "agents.specialized_agents",
+    "ResearchAgent": "agents.specialized_agents",
+    "CodeAgent": "agents.specialized_agents",
+    "AnalysisAgent": "agents.specialized_agents",
+    "CreativeAgent": "agents.specialized_agents",
+    "create_agent": "agents.specialized_agents",
+    "math_agent": "agents.specialized_agents",
+    "research_agent": "agents.specialized_agents",
+    "code_agent": "agents.specialized_agents",
+    "analysis_agent": "agents.specialized_agents",
+    "creative_agent": "agents.specialized_agents",
+    "ollama_config": "config.ollama_config",
+    "CUSTOM_TOOLS": "tools.custom_tools"
+}
+
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    # Cache so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 __all__ = [
     "OllamaStrandAgent",
+    "gather_chat",
     "MathAgent",
     "ResearchAgent",
     "CodeAgent", 
@@ -0,0 +1,37 @@
+"""
+Shared setup for the test scripts (main.py, test_interactive.py, test_vscode.py)
+
+Agents and the Ollama model probe are cached per process, so each is
+created at most once no matter how many tests ask for it.
+"""
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+import requests
+
+from config.ollama_config import ollama_config
+
+@lru_cache(maxsize=None)
+def get_agent(kind: str, model: str = None):
+    """
+    Get a shared specialized agent
+
+    Args:
+        kind: Agent type ('math', 'research', 'code', 'analysis', 'creative')
+        model: Ollama model to use (optional)
+    """
+    from agents.specialized_agents import create_agent
+    return create_agent(kind, model)
+
+@lru_cache(maxsize=1)
+def probe_ollama() -> Tuple[Dict[str, Any], ...]:
+    """
+    List the models installed in Ollama
+
+    Raises if Ollama is unreachable; failures are not cached, so a later
+    call probes again.
+    """
+    with requests.Session() as session:
+        response = session.get(f"{ollama_config.base_url}/api/tags", timeout=5)
+        response.raise_for_status()
+        return tuple(response.json().get('models', []))
@@ -2,19 +2,30 @@
 Base Agent class with Ollama integration for Amazon Strand Agents
 """
 import asyncio
+import hashlib
+import json
 import logging
-from typing import Optional, Dict, Any, List
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Hashable, Iterable, Tuple
 import ollama
 from strands import Agent
 from config.ollama_config import ollama_config
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of responses kept per agent in the LRU response cache
+RESPONSE_CACHE_SIZE = 512
+
 class OllamaStrandAgent:
     """
     Base class for Strand Agents with Ollama integration
     """
     
+    # (host, model) pairs already warmed up by this process
+    _warmed_up: set = set()
+    _warmup_lock = threading.Lock()
+    
     def __init__(
         self, 
         name: str,
@@ -27,106 +38,269 @@ class OllamaStrandAgent:
         self.model = model or ollama_config.default_model
         self.tools = tools or []
         self.system_prompt = system_prompt
-        self.config = ollama_config.get_model_config(self.model)
         
-        # Initialize the Strand Agent
-        self.strand_agent = Agent(
-            name=self.name,
-            tools=self.tools,
-            **kwargs
-        )
+        # LRU cache of completed responses and in-flight async requests
+        self._response_cache: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        
+        # Long-lived Ollama clients so HTTP connections are reused across calls.
+        # Agents are spread round-robin over the configured Ollama servers.
+        self._host = ollama_config.next_base_url()
+        self._client = ollama_config.get_client(self._host)
+        self.config = ollama_config.get_model_config(self.model, self._host)
+        self._aclients: Dict[str, ollama.AsyncClient] = {}
+        self._aclient_loop = None
+        
+        # Message history per conversation, replayed so the prompt prefix stays stable
+        self._histories: Dict[str, List[Dict[str, str]]] = {}
+        
+        # Full text of the most recent stream_chat response
+        self._last_full_response: Optional[str] = None
+        
+        # The Strand Agent is built on first access and rebuilt only when tools change
+        self._agent_kwargs = kwargs
+        self._strand_agent = None
+        self._agent_dirty = True
+        
+        if ollama_config.warmup:
+            self._start_warmup()
         
         logger.info(f"Initialized OllamaStrandAgent '{self.name}' with model '{self.model}'")
     
-    def chat(self, message: str, **kwargs) -> str:
+    def _start_warmup(self):
+        """
+        Load the model on the Ollama server in a background thread, once per
+        server and model, so the first chat does not pay the model load time
+        """
+        target = (self._host, self.model)
+        with self._warmup_lock:
+            if target in self._warmed_up:
+                return
+            self._warmed_up.add(target)
+        threading.Thread(target=self._warmup, daemon=True).start()
+    
+    def _warmup(self):
+        """
+        Ask Ollama to load the model; an empty prompt loads without generating
+        """
+        try:
+            self._client.generate(
+                model=self.model,
+                prompt="",
+                keep_alive=ollama_config.keep_alive
+            )
+            logger.debug(f"Warmed up model '{self.model}' on {self._host}")
+        except Exception as e:
+            # Allow a later agent to retry
+            with self._warmup_lock:
+                self._warmed_up.discard((self._host, self.model))
+            logger.debug(f"Warm-up of model '{self.model}' failed: {e}")
+    
+    @property
+    def strand_agent(self) -> Agent:
+        """
+        The underlying Strand Agent, (re)built lazily with the current tools
+
+        Each instance has its own Strand Agent. Agents carry conversation
+        messages, state and a callback handler, so they are never shared.
+        """
+        if self._agent_dirty:
+            self._strand_agent = Agent(
+                name=self.name,
+                tools=list(self.tools),
+                **self._agent_kwargs
+            )
+            self._agent_dirty = False
+        return self._strand_agent
+    
+    @property
+    def system_prompt(self) -> Optional[str]:
+        return self._system_prompt
+    
+    @system_prompt.setter
+    def system_prompt(self, value: Optional[str]):
+        # The system message is built once here rather than on every request
+        self._system_prompt = value
+        self._prefix_messages = (
+            ({"role": "system", "content": value},) if value else ()
+        )
+    
+    def chat(self, message: str, conversation_id: str = None, **kwargs) -> str:
         """
         Send a message to the agent and get a response
+
+        When conversation_id is given, earlier turns of that conversation are
+        sent as context and the exchange is appended to its history.
         """
+        kwargs.setdefault("keep_alive", ollama_config.keep_alive)
+        key = self._cache_key(message, kwargs, conversation_id)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
         try:
-            # Prepare the conversation
-            messages = []
-            
-            if self.system_prompt:
-                messages.append({
-                    "role": "system",
-                    "content": self.system_prompt
-                })
-            
-            messages.append({
-                "role": "user", 
-                "content": message
-            })
+            messages = self._build_msgs(message, conversation_id)
             
             # Use Ollama for the response
-            response = ollama.chat(
+            response = self._client_for(conversation_id).chat(
                 model=self.model,
                 messages=messages,
                 **kwargs
             )
             
-            return response['message']['content']
+            content = response['message']['content']
+            self._cache_put(key, content)
+            self._record_turn(conversation_id, message, content)
+            return content
             
         except Exception as e:
             logger.error(f"Error in chat: {e}")
             return f"Error: {str(e)}"
     
-    async def async_chat(self, message: str, **kwargs) -> str:
+    async def async_chat(self, message: str, conversation_id: str = None, **kwargs) -> str:
         """
         Async version of chat method
         """
-        try:
-            messages = []
-            
-            if self.system_prompt:
-                messages.append({
-                    "role": "system",
-                    "content": self.system_prompt
-                })
-            
-            messages.append({
-                "role": "user", 
-                "content": message
-            })
-            
-            # Use async Ollama client
-            response = await ollama.AsyncClient().chat(
-                model=self.model,
-                messages=messages,
-                **kwargs
+        kwargs.setdefault("keep_alive", ollama_config.keep_alive)
+        key = self._cache_key(message, kwargs, conversation_id)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        if key is None:
+            return await self._async_chat_request(key, message, conversation_id, **kwargs)
+        
+        # Identical requests already in flight share a single Ollama call. The
+        # call runs as its own task and each caller awaits it through a shield,
+        # so cancelling one caller does not cancel the others. The lookup and
+        # registration below do not await, so they are atomic with respect to
+        # other coroutines on the event loop.
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._async_chat_request(key, message, conversation_id, **kwargs)
             )
-            
-            return response['message']['content']
-            
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+    
+    async def _async_chat_request(
+        self, key: Optional[Hashable], message: str, conversation_id: str = None, **kwargs
+    ) -> str:
+        """
+        Run one async chat request and cache its response
+        """
+        try:
+            content = await self._async_chat_uncached(message, conversation_id, **kwargs)
+            self._cache_put(key, content)
+            self._record_turn(conversation_id, message, content)
+            return content
         except Exception as e:
             logger.error(f"Error in async_chat: {e}")
             return f"Error: {str(e)}"
     
-    def stream_chat(self, message: str, **kwargs):
+    async def _async_chat_uncached(
+        self, message: str, conversation_id: str = None, **kwargs
+    ) -> str:
+        """
+        Send a message to Ollama asynchronously, bypassing the response cache
+        """
+        messages = self._build_msgs(message, conversation_id)
+        
+        # Use async Ollama client
+        response = await self._get_async_client(self._host_for(conversation_id)).chat(
+            model=self.model,
+            messages=messages,
+            **kwargs
+        )
+        
+        return response['message']['content']
+    
+    def _build_msgs(self, message: str, conversation_id: str = None) -> List[Dict[str, str]]:
+        """
+        Build the message list for a request: system prompt, conversation
+        history (if any) and the new user message
+        """
+        if conversation_id is None:
+            return [*self._prefix_messages, {"role": "user", "content": message}]
+        
+        history = self._histories.get(conversation_id, [])
+        if history and logger.isEnabledFor(logging.DEBUG):
+            # Ollama reuses its KV cache when this prefix matches the previous turn
+            digest = hashlib.blake2b(
+                json.dumps(history).encode(), digest_size=8
+            ).hexdigest()
+            logger.debug(
+                f"Conversation '{conversation_id}': resending {len(history)} "
+                f"messages, prefix {digest}"
+            )
+        return [*self._prefix_messages, *history, {"role": "user", "content": message}]
+    
+    def _record_turn(self, conversation_id: Optional[str], message: str, content: str):
+        """
+        Append a completed exchange to the conversation history
+        """
+        if conversation_id is None:
+            return
+        self._histories.setdefault(conversation_id, []).extend((
+            {"role": "user", "content": message},
+            {"role": "assistant", "content": content}
+        ))
+    
+    def get_history(self, conversation_id: str) -> List[Dict[str, str]]:
+        """
+        Get the messages exchanged so far in a conversation
+        """
+        return list(self._histories.get(conversation_id, []))
+    
+    def reset_conversation(self, conversation_id: str = None):
+        """
+        Forget a conversation's history, or every conversation if no ID is given
+        """
+        if conversation_id is None:
+            self._histories.clear()
+        else:
+            self._histories.pop(conversation_id, None)
+    
+    async def batch_chat(self, messages: List[str], **kwargs) -> List[str]:
+        """
+        Send several messages concurrently and return the responses in order
+        """
+        return await _gather_bounded(
+            self.async_chat(message, **kwargs) for message in messages
+        )
+    
+    def stream_chat(self, message: str, conversation_id: str = None, **kwargs):
         """
         Stream response from the agent
         """
+        kwargs.setdefault("keep_alive", ollama_config.keep_alive)
+        key = self._cache_key(message, kwargs, conversation_id)
+        cached = self._cache_get(key)
+        if cached is not None:
+            # Replay the cached response as a single chunk
+            self._last_full_response = cached
+            yield cached
+            return
+        
         try:
-            messages = []
-            
-            if self.system_prompt:
-                messages.append({
-                    "role": "system",
-                    "content": self.system_prompt
-                })
-            
-            messages.append({
-                "role": "user", 
-                "content": message
-            })
+            messages = self._build_msgs(message, conversation_id)
             
-            # Stream response
-            for chunk in ollama.chat(
+            # Stream response, buffering chunks so the full reply can be cached
+            chunks = []
+            for chunk in self._client_for(conversation_id).chat(
                 model=self.model,
                 messages=messages,
                 stream=True,
                 **kwargs
             ):
-                yield chunk['message']['content']
+                content = chunk['message']['content']
+                chunks.append(content)
+                yield content
+            
+            self._last_full_response = "".join(chunks)
+            self._cache_put(key, self._last_full_response)
+            self._record_turn(conversation_id, message, self._last_full_response)
                 
         except Exception as e:
             logger.error(f"Error in stream_chat: {e}")
@@ -137,7 +311,7 @@ class OllamaStrandAgent:
         Get information about the current model
         """
         try:
-            return ollama.show(self.model)
+            return self._client.show(self.model)
         except Exception as e:
             logger.error(f"Error getting model info: {e}")
             return {"error": str(e)}
@@ -147,7 +321,7 @@ class OllamaStrandAgent:
         List all available models in Ollama
         """
         try:
-            models = ollama.list()
+            models = self._client.list()
             return [model['name'] for model in models['models']]
         except Exception as e:
             logger.error(f"Error listing models: {e}")
@@ -158,15 +332,123 @@ class OllamaStrandAgent:
         Add a tool to the agent
         """
         self.tools.append(tool)
-        # Reinitialize strand agent with new tools
-        self.strand_agent = Agent(
-            name=self.name,
-            tools=self.tools
-        )
+        # Responses produced without the new tool are no longer valid
+        self.clear_cache()
+        # Defer rebuilding the strand agent until it is next used
+        self._agent_dirty = True
         logger.info(f"Added tool to agent '{self.name}'")
     
+    def _host_for(self, conversation_id: Optional[str]) -> str:
+        """
+        Pick the Ollama server for a request
+
+        A conversation always goes to the same server so its KV cache stays warm.
+        """
+        if conversation_id is None or len(ollama_config.base_urls) == 1:
+            return self._host
+        return ollama_config.base_url_for(conversation_id)
+    
+    def _client_for(self, conversation_id: Optional[str]) -> ollama.Client:
+        """
+        Get the sync client for a request's server
+        """
+        host = self._host_for(conversation_id)
+        return self._client if host == self._host else ollama_config.get_client(host)
+    
+    def _get_async_client(self, host: str = None) -> ollama.AsyncClient:
+        """
+        Return the async Ollama client for a server, creating it on first use
+
+        The underlying connection pools are bound to an event loop, so the
+        clients are recreated when called from a different loop.
+        """
+        host = host or self._host
+        loop = asyncio.get_running_loop()
+        if self._aclient_loop is not loop:
+            self._aclients = {}
+            self._aclient_loop = loop
+        if host not in self._aclients:
+            self._aclients[host] = ollama.AsyncClient(host=host)
+        return self._aclients[host]
+    
+    def clear_cache(self):
+        """
+        Drop all cached responses for this agent
+        """
+        self._response_cache.clear()
+    
+    def _cache_key(
+        self, message: str, kwargs: Dict[str, Any], conversation_id: str = None
+    ) -> Optional[Hashable]:
+        """
+        Build the response cache key, or None if the request is not cacheable
+        """
+        if conversation_id is not None:
+            # Replies depend on the conversation history, so they are not cached
+            return None
+        try:
+            # Building the frozenset hashes every kwarg value
+            return (self.model, self.system_prompt, message, frozenset(kwargs.items()))
+        except TypeError:
+            # Unhashable kwargs (e.g. an options dict) bypass the cache
+            return None
+    
+    def _cache_get(self, key: Optional[Hashable]) -> Optional[str]:
+        """
+        Look up a cached response and mark it as most recently used
+        """
+        if key is None or key not in self._response_cache:
+            return None
+        self._response_cache.move_to_end(key)
+        return self._response_cache[key]
+    
+    def _cache_put(self, key: Optional[Hashable], content: str):
+        """
+        Store a response, evicting the least recently used entry when full
+        """
+        if key is None:
+            return
+        self._response_cache[key] = content
+        self._response_cache.move_to_end(key)
+        if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+    
     def __str__(self):
         return f"OllamaStrandAgent(name={self.name}, model={self.model})"
     
     def __repr__(self):
-        return self.__str__()
\ No newline at end of file
+        return self.__str__()
+
+
+async def gather_chat(
+    agents_and_messages: Iterable[Tuple["OllamaStrandAgent", str]],
+    **kwargs
+) -> List[str]:
+    """
+    Send messages to several agents concurrently
+
+    Args:
+        agents_and_messages: Pairs of (agent, message)
+
+    Returns:
+        Responses in the same order as the input pairs
+    """
+    return await _gather_bounded(
+        agent.async_chat(message, **kwargs) for agent, message in agents_and_messages
+    )
+
+async def _gather_bounded(coros: Iterable) -> List[Any]:
+    """
+    Await coroutines concurrently, keeping at most OLLAMA_NUM_PARALLEL in flight
+    """
+    limit = asyncio.Semaphore(ollama_config.num_parallel)
+    
+    async def run(coro):
+        async with limit:
+            return await coro
+    
+    tasks = [run(coro) for coro in coros]
+    logger.debug(
+        f"Dispatching {len(tasks)} requests with OLLAMA_NUM_PARALLEL={ollama_config.num_parallel}"
+    )
+    return await asyncio.gather(*tasks)
\ No newline at end of file
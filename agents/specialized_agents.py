@@ -2,7 +2,10 @@
 Specialized Agent Examples for Amazon Strand Agents with Ollama
 """
 import logging
+import textwrap
+from typing import Optional
 from agents.ollama_agent import OllamaStrandAgent
+from config.ollama_config import ollama_config, Quality
 from strands_tools import calculator
 
 logger = logging.getLogger(__name__)
@@ -12,8 +15,8 @@ class MathAgent(OllamaStrandAgent):
     Specialized agent for mathematical calculations and problem solving
     """
     
-    def __init__(self, model: str = "llama3.2"):
-        system_prompt = """
+    # Dedented once at class definition so every request sends a byte-identical prompt
+    SYSTEM_PROMPT = textwrap.dedent("""
         You are a mathematical expert assistant. You excel at:
         - Solving complex mathematical problems
         - Explaining mathematical concepts clearly
@@ -21,13 +24,14 @@ class MathAgent(OllamaStrandAgent):
         - Working with statistics, algebra, calculus, and more
         
         Always show your work step-by-step and use the calculator tool when needed.
-        """
-        
+    """).strip()
+    
+    def __init__(self, model: str = "llama3.2"):
         super().__init__(
             name="MathAgent",
             model=model,
             tools=[calculator],
-            system_prompt=system_prompt
+            system_prompt=self.SYSTEM_PROMPT
         )
 
 class ResearchAgent(OllamaStrandAgent):
@@ -35,8 +39,7 @@ class ResearchAgent(OllamaStrandAgent):
     Specialized agent for research and information gathering
     """
     
-    def __init__(self, model: str = "llama3.2"):
-        system_prompt = """
+    SYSTEM_PROMPT = textwrap.dedent("""
         You are a research specialist assistant. You excel at:
         - Finding and analyzing information from various sources
         - Summarizing complex topics
@@ -44,13 +47,14 @@ class ResearchAgent(OllamaStrandAgent):
         - Providing comprehensive research reports
         
         Always cite your sources and provide accurate, up-to-date information.
-        """
-        
+    """).strip()
+    
+    def __init__(self, model: str = "llama3.2"):
         super().__init__(
             name="ResearchAgent",
             model=model,
             tools=[],  # Web search tool not available yet
-            system_prompt=system_prompt
+            system_prompt=self.SYSTEM_PROMPT
         )
 
 class CodeAgent(OllamaStrandAgent):
@@ -58,8 +62,7 @@ class CodeAgent(OllamaStrandAgent):
     Specialized agent for programming and code-related tasks
     """
     
-    def __init__(self, model: str = "codellama"):
-        system_prompt = """
+    SYSTEM_PROMPT = textwrap.dedent("""
         You are a programming expert assistant. You excel at:
         - Writing clean, efficient code in multiple languages
         - Debugging and troubleshooting code issues
@@ -68,13 +71,14 @@ class CodeAgent(OllamaStrandAgent):
         - Best practices and design patterns
         
         Always provide working code examples with clear explanations.
-        """
-        
+    """).strip()
+    
+    def __init__(self, model: str = "codellama"):
         super().__init__(
             name="CodeAgent",
             model=model,
             tools=[],
-            system_prompt=system_prompt
+            system_prompt=self.SYSTEM_PROMPT
         )
 
 class AnalysisAgent(OllamaStrandAgent):
@@ -82,8 +86,7 @@ class AnalysisAgent(OllamaStrandAgent):
     Specialized agent for data analysis and insights
     """
     
-    def __init__(self, model: str = "llama3.2"):
-        system_prompt = """
+    SYSTEM_PROMPT = textwrap.dedent("""
         You are a data analysis expert assistant. You excel at:
         - Analyzing datasets and finding patterns
         - Creating data visualizations
@@ -92,13 +95,14 @@ class AnalysisAgent(OllamaStrandAgent):
         - Machine learning concepts
         
         Always provide clear insights with supporting evidence.
-        """
-        
+    """).strip()
+    
+    def __init__(self, model: str = "llama3.2"):
         super().__init__(
             name="AnalysisAgent",
             model=model,
             tools=[calculator],
-            system_prompt=system_prompt
+            system_prompt=self.SYSTEM_PROMPT
         )
 
 class CreativeAgent(OllamaStrandAgent):
@@ -106,8 +110,7 @@ class CreativeAgent(OllamaStrandAgent):
     Specialized agent for creative writing and content generation
     """
     
-    def __init__(self, model: str = "llama3.2"):
-        system_prompt = """
+    SYSTEM_PROMPT = textwrap.dedent("""
         You are a creative writing expert assistant. You excel at:
         - Creative writing and storytelling
         - Content creation for various formats
@@ -116,23 +119,26 @@ class CreativeAgent(OllamaStrandAgent):
         - Adapting tone and style for different audiences
         
         Always be creative, engaging, and original in your responses.
-        """
-        
+    """).strip()
+    
+    def __init__(self, model: str = "llama3.2"):
         super().__init__(
             name="CreativeAgent",
             model=model,
             tools=[],
-            system_prompt=system_prompt
+            system_prompt=self.SYSTEM_PROMPT
         )
 
 # Agent factory function
-def create_agent(agent_type: str, model: str = None) -> OllamaStrandAgent:
+def create_agent(agent_type: str, model: str = None, quality: Optional[Quality] = None) -> OllamaStrandAgent:
     """
     Factory function to create different types of agents
     
     Args:
         agent_type: Type of agent to create ('math', 'research', 'code', 'analysis', 'creative')
         model: Ollama model to use (optional)
+        quality: Pick a quantized model by tier ('fast', 'balanced', 'best')
+            when no model is given (optional)
     
     Returns:
         Initialized agent instance
@@ -150,6 +156,9 @@ def create_agent(agent_type: str, model: str = None) -> OllamaStrandAgent:
     
     agent_class = agents[agent_type.lower()]
     
+    if not model and quality:
+        model = ollama_config.get_quality_model(quality)
+    
     if model:
         return agent_class(model=model)
     else:
@@ -1,8 +1,42 @@
 """
 Ollama Configuration for Amazon Strand Agents
 """
+import itertools
 import os
-from typing import Dict, Any
+import threading
+import zlib
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Literal, Mapping, Tuple
+
+# Speed/quality trade-off used to pick a quantized model
+Quality = Literal["fast", "balanced", "best"]
+
+# Commonly used models
+AVAILABLE_MODELS = (
+    "llama3.2",
+    "llama3.2:3b",
+    "llama3.1",
+    "codellama",
+    "mistral",
+    "phi3",
+    "gemma2",
+    "llama3.2:1b-instruct-q4_0",
+    "llama3.2:3b-instruct-q4_0",
+    "llama3.1:8b-instruct-q8_0"
+)
+
+@lru_cache(maxsize=32)
+def _get_model_config_cached(base_url: str, model: str, timeout: int) -> Mapping[str, Any]:
+    """Build a read-only model configuration, shared by every caller"""
+    return MappingProxyType({
+        "base_url": base_url,
+        "model": model,
+        "timeout": timeout,
+        "stream": False,
+        "temperature": 0.7,
+        "max_tokens": 2048
+    })
 
 class OllamaConfig:
     """Configuration class for Ollama integration with Strand Agents"""
@@ -11,30 +45,71 @@ class OllamaConfig:
         self.base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
         self.default_model = os.getenv("OLLAMA_DEFAULT_MODEL", "llama3.2")
         self.timeout = int(os.getenv("OLLAMA_TIMEOUT", "30"))
+        # Should match the server's OLLAMA_NUM_PARALLEL (requests served concurrently)
+        self.num_parallel = int(os.getenv("OLLAMA_NUM_PARALLEL", "8"))
+        # How long Ollama keeps a model (and its prompt cache) loaded after a request
+        self.keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+        # Load each model in the background when an agent is created
+        self.warmup = os.getenv("OLLAMA_NO_WARMUP") != "1"
+        # Quantized models per quality tier; smaller weights decode faster
+        self.quality_models: Dict[str, str] = {
+            "fast": os.getenv("OLLAMA_FAST_MODEL", "llama3.2:1b-instruct-q4_0"),
+            "balanced": os.getenv("OLLAMA_BALANCED_MODEL", "llama3.2:3b-instruct-q4_0"),
+            "best": os.getenv("OLLAMA_BEST_MODEL", "llama3.1:8b-instruct-q8_0")
+        }
+        # Comma-separated Ollama servers to spread agents across (defaults to base_url)
+        self.base_urls: List[str] = [
+            url.strip()
+            for url in os.getenv("OLLAMA_BASE_URLS", self.base_url).split(",")
+            if url.strip()
+        ]
+        self._rr = itertools.cycle(self.base_urls)
+        self._clients: Dict[str, Any] = {}
+        self._clients_lock = threading.Lock()
         
-    def get_model_config(self, model_name: str = None) -> Dict[str, Any]:
-        """Get configuration for a specific model"""
+    @property
+    def fast_model(self) -> str:
+        """Smallest configured model, for short prompts and quick tests"""
+        return self.quality_models["fast"]
+    
+    def get_quality_model(self, quality: Quality) -> str:
+        """Get the model configured for a quality tier"""
+        if quality not in self.quality_models:
+            raise ValueError(f"Unknown quality: {quality}. Available: {list(self.quality_models.keys())}")
+        return self.quality_models[quality]
+    
+    def get_model_config(self, model_name: str = None, base_url: str = None) -> Mapping[str, Any]:
+        """Get configuration for a specific model and server (read-only, cached)"""
         model = model_name or self.default_model
-        return {
-            "base_url": self.base_url,
-            "model": model,
-            "timeout": self.timeout,
-            "stream": False,
-            "temperature": 0.7,
-            "max_tokens": 2048
-        }
+        return _get_model_config_cached(base_url or self.base_url, model, self.timeout)
     
-    def get_available_models(self) -> list:
-        """Return list of commonly used models"""
-        return [
-            "llama3.2",
-            "llama3.2:3b",
-            "llama3.1",
-            "codellama",
-            "mistral",
-            "phi3",
-            "gemma2"
-        ]
+    def get_client(self, base_url: str = None):
+        """Get the shared ollama.Client for a server, creating it on first use"""
+        base_url = base_url or self.base_url
+        with self._clients_lock:
+            client = self._clients.get(base_url)
+            if client is None:
+                # Imported here so loading the configuration stays lightweight
+                import ollama
+                client = self._clients[base_url] = ollama.Client(host=base_url)
+        return client
+    
+    def next_base_url(self) -> str:
+        """Pick the next server in round-robin order"""
+        with self._clients_lock:
+            return next(self._rr)
+    
+    def next_client(self):
+        """Get the client for the next server in round-robin order"""
+        return self.get_client(self.next_base_url())
+    
+    def base_url_for(self, key: str) -> str:
+        """Map a key (e.g. a conversation ID) to the same server every time"""
+        return self.base_urls[zlib.crc32(key.encode()) % len(self.base_urls)]
+    
+    def get_available_models(self) -> Tuple[str, ...]:
+        """Return commonly used models"""
+        return AVAILABLE_MODELS
 
 # Global configuration instance
 ollama_config = OllamaConfig()
\ No newline at end of file
@@ -2,33 +2,49 @@
 """
 Test script for Amazon Strand Agents with Ollama integration
 """
+import asyncio
 import sys
 import os
-import requests
+import subprocess
+import aiohttp
+import orjson
 import time
+from config.ollama_config import ollama_config
 
-def test_ollama_connection():
+try:
+    # libuv-based event loop; falls back to asyncio's default where unavailable
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
+# The server the agents use (OLLAMA_BASE_URL), not a hard-coded localhost
+OLLAMA_URL = ollama_config.base_url
+
+async def test_ollama_connection(session):
     """Test if Ollama is running and accessible"""
     print("🔍 Testing Ollama connection...")
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=5)
-        if response.status_code == 200:
-            models = response.json().get('models', [])
-            print(f"✅ Ollama is running with {len(models)} model(s)")
-            for model in models:
-                print(f"   - {model['name']}")
-            return True, models
-        else:
-            print(f"❌ Ollama responded with status code: {response.status_code}")
-            return False, []
-    except requests.exceptions.ConnectionError:
+        async with session.get(
+            f"{OLLAMA_URL}/api/tags", timeout=aiohttp.ClientTimeout(total=5)
+        ) as response:
+            if response.status == 200:
+                models = orjson.loads(await response.read()).get('models', [])
+                print(f"✅ Ollama is running with {len(models)} model(s)")
+                for model in models:
+                    print(f"   - {model['name']}")
+                return True, models
+            else:
+                print(f"❌ Ollama responded with status code: {response.status}")
+                return False, []
+    except aiohttp.ClientConnectionError:
         print("❌ Cannot connect to Ollama. Make sure it's running with: ollama serve")
         return False, []
     except Exception as e:
         print(f"❌ Error connecting to Ollama: {e}")
         return False, []
 
-def test_simple_ollama_chat(model_name="deepseek-r1:7b"):
+async def test_simple_ollama_chat(session, model_name=ollama_config.fast_model):
     """Test direct Ollama chat API"""
     print(f"\n🤖 Testing direct Ollama chat with {model_name}...")
     
@@ -38,31 +54,48 @@ def test_simple_ollama_chat(model_name="deepseek-r1:7b"):
             "messages": [
                 {"role": "user", "content": "What is 2 + 2? Please answer briefly."}
             ],
-            "stream": False
+            "stream": True
         }
         
         print("   Sending request to Ollama...")
-        response = requests.post(
-            "http://localhost:11434/api/chat", 
-            json=payload, 
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            answer = result.get('message', {}).get('content', 'No content')
-            print(f"✅ Ollama responded: {answer.strip()}")
-            return True
-        else:
-            print(f"❌ Chat failed with status: {response.status_code}")
-            print(f"Response: {response.text}")
-            return False
+        start = time.perf_counter()
+        async with session.post(
+            f"{OLLAMA_URL}/api/chat", 
+            data=orjson.dumps(payload), 
+            headers={"Content-Type": "application/json"},
+            timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+            if response.status == 200:
+                # Ollama streams one JSON object per line
+                chunks = []
+                first_token_time = None
+                async for line in response.content:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    delta = orjson.loads(line)
+                    content = delta.get('message', {}).get('content', '')
+                    if content and first_token_time is None:
+                        first_token_time = time.perf_counter() - start
+                    chunks.append(content)
+                    if delta.get('done'):
+                        break
+                
+                answer = "".join(chunks) or 'No content'
+                if first_token_time is not None:
+                    print(f"   First token after {first_token_time:.2f}s")
+                print(f"✅ Ollama responded: {answer.strip()}")
+                return True
+            else:
+                print(f"❌ Chat failed with status: {response.status}")
+                print(f"Response: {await response.text()}")
+                return False
             
     except Exception as e:
         print(f"❌ Error in chat: {e}")
         return False
 
-def test_ollama_agent():
+async def test_ollama_agent():
     """Test our custom Ollama agent"""
     print(f"\n🎯 Testing custom Ollama agent...")
     
@@ -70,15 +103,26 @@ def test_ollama_agent():
         # Import our custom agent
         from agents.ollama_agent import OllamaStrandAgent
         
-        # Create agent with available model
+        # Short test prompts only need the small quantized model
         agent = OllamaStrandAgent(
             name="TestAgent",
-            model="deepseek-r1:7b",
+            model=ollama_config.fast_model,
             system_prompt="You are a helpful assistant. Keep responses brief and clear."
         )
         
         print("   Created agent, testing chat...")
-        response = agent.chat("What is the square root of 1764?")
+        
+        def consume_stream():
+            start = time.perf_counter()
+            chunks = []
+            for chunk in agent.stream_chat("What is the square root of 1764?"):
+                if not chunks:
+                    print(f"   First token after {time.perf_counter() - start:.2f}s")
+                chunks.append(chunk)
+            return "".join(chunks)
+        
+        # stream_chat is a blocking generator, so drain it off the event loop
+        response = await asyncio.to_thread(consume_stream)
         print(f"✅ Agent responded: {response}")
         return True
         
@@ -90,18 +134,18 @@ def test_ollama_agent():
         print(f"❌ Agent error: {e}")
         return False
 
-def test_specialized_agents():
+async def test_specialized_agents():
     """Test specialized agents"""
     print(f"\n🔧 Testing specialized agents...")
     
     try:
-        from agents.specialized_agents import math_agent
+        from _fixtures import get_agent
         
-        # Create math agent with available model
-        math_ai = math_agent(model="deepseek-r1:7b")
+        # Create math agent with the small quantized model
+        math_ai = get_agent("math", ollama_config.fast_model)
         
         print("   Testing math agent...")
-        response = math_ai.chat("Calculate 15 * 24")
+        response = await math_ai.async_chat("Calculate 15 * 24")
         print(f"✅ Math agent: {response[:100]}...")
         return True
         
@@ -109,32 +153,41 @@ def test_specialized_agents():
         print(f"❌ Specialized agent error: {e}")
         return False
 
+async def run_tests():
+    """Run the connection test, then the chat tests concurrently"""
+    async with aiohttp.ClientSession() as session:
+        # Test 1: Ollama connection
+        ollama_ok, models = await test_ollama_connection(session)
+        if not ollama_ok:
+            print("\n❌ Cannot proceed without Ollama. Please run: ollama serve")
+            sys.exit(1)
+        
+        # The chat tests use the fast quantized model; pull it if missing
+        model_name = ollama_config.fast_model
+        if model_name not in {model["name"] for model in models}:
+            print(f"\n⚠️  {model_name} not found. Installing it...")
+            # OLLAMA_HOST points the CLI at the same server
+            subprocess.run(
+                ["ollama", "pull", model_name],
+                env={**os.environ, "OLLAMA_HOST": OLLAMA_URL}
+            )
+        
+        # Tests 2-4: Direct Ollama chat, custom agent and specialized agents,
+        # run concurrently so their requests overlap on the Ollama server
+        chat_ok, agent_ok, specialized_ok = await asyncio.gather(
+            test_simple_ollama_chat(session, model_name),
+            test_ollama_agent(),
+            test_specialized_agents()
+        )
+    
+    return ollama_ok, chat_ok, agent_ok, specialized_ok
+
 def main():
     """Run all tests"""
     print("🚀 Amazon Strand Agents + Ollama Test Suite")
     print("=" * 50)
     
-    # Test 1: Ollama connection
-    ollama_ok, models = test_ollama_connection()
-    if not ollama_ok:
-        print("\n❌ Cannot proceed without Ollama. Please run: ollama serve")
-        sys.exit(1)
-    
-    if not models:
-        print("\n⚠️  No models found. Installing a basic model...")
-        os.system("ollama pull llama3.2:3b")
-        models = [{"name": "llama3.2:3b"}]
-    
-    model_name = models[0]["name"]
-    
-    # Test 2: Direct Ollama chat
-    chat_ok = test_simple_ollama_chat(model_name)
-    
-    # Test 3: Custom agent
-    agent_ok = test_ollama_agent()
-    
-    # Test 4: Specialized agents
-    specialized_ok = test_specialized_agents()
+    ollama_ok, chat_ok, agent_ok, specialized_ok = asyncio.run(run_tests())
     
     # Summary
     print(f"\n📋 Test Results:")
@@ -2,9 +2,16 @@
 """
 Interactive test script for Amazon Strand Agents with Ollama
 """
+import asyncio
 import sys
 import os
-import requests
+
+try:
+    # libuv-based event loop for the concurrent "all agents" requests
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
 
 def interactive_test():
     """Interactive testing session"""
@@ -13,8 +20,8 @@ def interactive_test():
     
     # Check Ollama
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=5)
-        models = response.json().get('models', [])
+        from _fixtures import probe_ollama
+        models = probe_ollama()
         if not models:
             print("⚠️  No models found. Let's pull one...")
             os.system("ollama pull llama3.2:3b")
@@ -29,7 +36,8 @@ def interactive_test():
     
     # Import agents
     try:
-        from agents.specialized_agents import math_agent, creative_agent, code_agent
+        from agents.ollama_agent import gather_chat
+        from _fixtures import get_agent
         print("✅ Agents imported successfully")
     except Exception as e:
         print(f"❌ Import error: {e}")
@@ -37,23 +45,42 @@ def interactive_test():
     
     # Create agents
     agents = {
-        "1": ("Math Agent", math_agent(model=model_name)),
-        "2": ("Creative Agent", creative_agent(model=model_name)),
-        "3": ("Code Agent", code_agent(model=model_name))
+        "1": ("Math Agent", get_agent("math", model_name)),
+        "2": ("Creative Agent", get_agent("creative", model_name)),
+        "3": ("Code Agent", get_agent("code", model_name))
     }
     
     print(f"\n🎯 Available Agents:")
     for key, (name, _) in agents.items():
         print(f"   {key}. {name}")
+    print(f"   a. All agents at once")
     
     while True:
         print(f"\n" + "─" * 40)
-        choice = input("Choose agent (1-3) or 'q' to quit: ").strip()
+        choice = input("Choose agent (1-3), 'a' for all or 'q' to quit: ").strip()
         
         if choice.lower() == 'q':
             print("👋 Goodbye!")
             break
         
+        if choice.lower() == 'a':
+            message = input("Your message: ").strip()
+            if not message:
+                continue
+            
+            print(f"\n💭 All agents are thinking...")
+            try:
+                responses = asyncio.run(gather_chat(
+                    ((agent, message) for _, agent in agents.values()),
+                    conversation_id="interactive"
+                ))
+                for (agent_name, _), response in zip(agents.values(), responses):
+                    print(f"\n🗣️  {agent_name}:")
+                    print(f"   {response}")
+            except Exception as e:
+                print(f"❌ Error: {e}")
+            continue
+        
         if choice not in agents:
             print("❌ Invalid choice")
             continue
@@ -67,9 +94,13 @@ def interactive_test():
         
         print(f"\n💭 {agent_name} is thinking...")
         try:
-            response = agent.chat(message)
             print(f"\n🗣️  {agent_name}:")
-            print(f"   {response}")
+            sys.stdout.write("   ")
+            # Print tokens as they arrive instead of waiting for the full reply
+            for chunk in agent.stream_chat(message, conversation_id="interactive"):
+                sys.stdout.write(chunk)
+                sys.stdout.flush()
+            print()
         except Exception as e:
             print(f"❌ Error: {e}")
 
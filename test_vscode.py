@@ -1,6 +1,8 @@
 """
 VS Code Integration Test for Amazon Strand Agents
-Run this in a Jupyter notebook to verify everything works
+Run this script, or in a Jupyter notebook run:
+    from test_vscode import test_vscode_integration
+    test_vscode_integration()
 """
 
 def test_vscode_integration():
@@ -17,7 +19,8 @@ def test_vscode_integration():
     try:
         import ollama
         import jupyter
-        from agents.specialized_agents import math_agent
+        from _fixtures import get_agent
+        from config.ollama_config import ollama_config
         print("✅ All packages imported successfully")
     except ImportError as e:
         print(f"❌ Import error: {e}")
@@ -25,7 +28,7 @@ def test_vscode_integration():
     
     # Test 3: Agent creation
     try:
-        agent = math_agent(model="deepseek-r1:7b")
+        agent = get_agent("math", ollama_config.fast_model)
         print("✅ Agent created successfully")
     except Exception as e:
         print(f"❌ Agent creation failed: {e}")
@@ -42,9 +45,5 @@ def test_vscode_integration():
     print("\n🎉 All tests passed! VS Code integration is working.")
     return True
 
-# Auto-run when imported
 if __name__ == "__main__":
-    test_vscode_integration()
-else:
-    # Run automatically in notebook
     test_vscode_integration()
\ No newline at end of file
@@ -2,14 +2,33 @@
 Custom Tools for Amazon Strand Agents
 """
 import json
+import orjson
+import re
 import requests
 import logging
-from typing import Dict, Any, List
+from collections import Counter
+from types import MappingProxyType
+from typing import Dict, Any, List, Union
 from datetime import datetime
-import os
 
 logger = logging.getLogger(__name__)
 
+# Text analysis patterns, compiled once at import. Words for the most common
+# words counter may contain inner apostrophes or hyphens ("don't", "e-mail")
+# and '.' or ',' between digits ("3.14", "10,000"). A sentence ends at a run
+# of terminators followed by whitespace or the end of the text, so "Wait..."
+# and "3.14" do not count extra sentences.
+WORD_PATTERN = re.compile(r"\w+(?:(?:['-]|(?<=\d)[.,](?=\d))\w+)*")
+SENTENCE_END_PATTERN = re.compile(r"[.!?]+(?=\s|$)")
+PARAGRAPH_BREAK_PATTERN = re.compile(r"\n\s*\n")
+
+# Numbers with 19+ leading digits, at the start of a value (after the document
+# start, '[', ':' or ','); orjson turns integers beyond 64 bits into floats.
+# Matching only value positions skips long digit runs inside strings.
+_LONG_NUMBER = r"(?:^|[\[:,])\s*-?\d{19,}"
+LONG_INTEGER_PATTERN = re.compile(_LONG_NUMBER)
+LONG_INTEGER_BYTES_PATTERN = re.compile(_LONG_NUMBER.encode())
+
 def weather_tool(location: str) -> Dict[str, Any]:
     """
     Get weather information for a location
@@ -46,18 +65,25 @@ def file_reader_tool(file_path: str) -> Dict[str, Any]:
         File contents or error message
     """
     try:
-        if not os.path.exists(file_path):
-            return {"error": f"File not found: {file_path}"}
+        with open(file_path, 'rb') as file:
+            data = file.read()
+        
+        content = data.decode('utf-8', errors='replace')
+        if b'\r' in data:
+            # Normalise newlines as text mode would
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        
+        # Count newlines directly rather than splitting into a list of lines
+        lines = content.count('\n') + (0 if content.endswith('\n') else 1)
         
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-            
         return {
             "file_path": file_path,
             "content": content,
-            "size": len(content),
-            "lines": len(content.split('\n'))
+            "size": len(data),
+            "lines": lines
         }
+    except FileNotFoundError:
+        return {"error": f"File not found: {file_path}"}
     except Exception as e:
         logger.error(f"File reader tool error: {e}")
         return {"error": str(e)}
@@ -73,7 +99,7 @@ def json_validator_tool(json_string: str) -> Dict[str, Any]:
         Validation results
     """
     try:
-        parsed = json.loads(json_string)
+        parsed = parse_json(json_string)
         return {
             "valid": True,
             "parsed_data": parsed,
@@ -90,6 +116,23 @@ def json_validator_tool(json_string: str) -> Dict[str, Any]:
         logger.error(f"JSON validator tool error: {e}")
         return {"error": str(e)}
 
+def parse_json(json_string: Union[str, bytes]) -> Any:
+    """
+    Parse JSON with orjson, falling back to the standard library for input
+    orjson handles differently (big integers, lone surrogates, out-of-range
+    floats) so results match json.loads exactly
+    """
+    if isinstance(json_string, (bytes, bytearray)):
+        pattern = LONG_INTEGER_BYTES_PATTERN
+    else:
+        pattern = LONG_INTEGER_PATTERN
+    if pattern.search(json_string):
+        return json.loads(json_string)
+    try:
+        return orjson.loads(json_string)
+    except orjson.JSONDecodeError:
+        return json.loads(json_string)
+
 def text_analyzer_tool(text: str) -> Dict[str, Any]:
     """
     Analyze text for basic statistics
@@ -101,16 +144,30 @@ def text_analyzer_tool(text: str) -> Dict[str, Any]:
         Text analysis results
     """
     try:
-        words = text.split()
-        sentences = text.split('.')
-        paragraphs = text.split('\n\n')
+        # Words are whitespace-separated tokens, so "3.14" and "$10,000"
+        # count once; the regex only feeds the most-common-words counter
+        word_count = len(text.split())
+        words = WORD_PATTERN.findall(text.lower())
+        
+        sentence_count = 0
+        last_end = 0
+        for match in SENTENCE_END_PATTERN.finditer(text):
+            sentence_count += 1
+            last_end = match.end()
+        if text[last_end:].strip():
+            # Trailing text without a terminator is a sentence too
+            sentence_count += 1
+        
+        paragraph_count = sum(
+            1 for paragraph in PARAGRAPH_BREAK_PATTERN.split(text) if paragraph.strip()
+        )
         
         return {
             "character_count": len(text),
-            "word_count": len(words),
-            "sentence_count": len([s for s in sentences if s.strip()]),
-            "paragraph_count": len([p for p in paragraphs if p.strip()]),
-            "average_words_per_sentence": round(len(words) / max(len([s for s in sentences if s.strip()]), 1), 2),
+            "word_count": word_count,
+            "sentence_count": sentence_count,
+            "paragraph_count": paragraph_count,
+            "average_words_per_sentence": round(word_count / max(sentence_count, 1), 2),
             "most_common_words": get_most_common_words(words, 5)
         }
     except Exception as e:
@@ -121,14 +178,10 @@ def get_most_common_words(words: List[str], top_n: int = 5) -> List[Dict[str, An
     """
     Get most common words from a list
     """
-    word_count = {}
-    for word in words:
-        clean_word = word.lower().strip('.,!?;:"()[]{}')
-        if clean_word and len(clean_word) > 2:  # Ignore short words
-            word_count[clean_word] = word_count.get(clean_word, 0) + 1
-    
-    sorted_words = sorted(word_count.items(), key=lambda x: x[1], reverse=True)
-    return [{"word": word, "count": count} for word, count in sorted_words[:top_n]]
+    word_count = Counter(
+        word.lower() for word in words if len(word) > 2  # Ignore short words
+    )
+    return [{"word": word, "count": count} for word, count in word_count.most_common(top_n)]
 
 def timestamp_tool() -> Dict[str, Any]:
     """
@@ -146,6 +199,55 @@ def timestamp_tool() -> Dict[str, Any]:
         "time_only": now.strftime("%H:%M:%S")
     }
 
+# Unit factors relative to each type's base unit (meter, kilogram).
+# Temperature is not a linear scale and is handled separately.
+UNIT_CONVERSIONS = MappingProxyType({
+    "length": MappingProxyType({
+        "meter": 1.0,
+        "kilometer": 1000.0,
+        "centimeter": 0.01,
+        "millimeter": 0.001,
+        "inch": 0.0254,
+        "foot": 0.3048,
+        "yard": 0.9144,
+        "mile": 1609.34
+    }),
+    "weight": MappingProxyType({
+        "kilogram": 1.0,
+        "gram": 0.001,
+        "pound": 0.453592,
+        "ounce": 0.0283495,
+        "ton": 1000.0
+    })
+})
+
+# Precomputed multiplier for every (unit_type, from_unit, to_unit) pair
+UNIT_RATIOS = MappingProxyType({
+    (unit_type, from_unit, to_unit): units[from_unit] / units[to_unit]
+    for unit_type, units in UNIT_CONVERSIONS.items()
+    for from_unit in units
+    for to_unit in units
+})
+
+_TO_CELSIUS = {
+    "celsius": lambda v: v,
+    "fahrenheit": lambda v: (v - 32) * 5/9,
+    "kelvin": lambda v: v - 273.15
+}
+
+_FROM_CELSIUS = {
+    "celsius": lambda c: c,
+    "fahrenheit": lambda c: c * 9/5 + 32,
+    "kelvin": lambda c: c + 273.15
+}
+
+# Direct conversion function for every (from_unit, to_unit) temperature pair
+TEMPERATURE_CONVERSIONS = MappingProxyType({
+    (from_unit, to_unit): (lambda v, f=to_c, g=from_c: g(f(v)))
+    for from_unit, to_c in _TO_CELSIUS.items()
+    for to_unit, from_c in _FROM_CELSIUS.items()
+})
+
 def unit_converter_tool(value: float, from_unit: str, to_unit: str, unit_type: str) -> Dict[str, Any]:
     """
     Convert between different units
@@ -160,42 +262,16 @@ def unit_converter_tool(value: float, from_unit: str, to_unit: str, unit_type: s
         Conversion result
     """
     try:
-        conversions = {
-            "length": {
-                "meter": 1.0,
-                "kilometer": 1000.0,
-                "centimeter": 0.01,
-                "millimeter": 0.001,
-                "inch": 0.0254,
-                "foot": 0.3048,
-                "yard": 0.9144,
-                "mile": 1609.34
-            },
-            "weight": {
-                "kilogram": 1.0,
-                "gram": 0.001,
-                "pound": 0.453592,
-                "ounce": 0.0283495,
-                "ton": 1000.0
-            },
-            "temperature": {
-                # Special case - handled separately
-            }
-        }
-        
         if unit_type == "temperature":
             result = convert_temperature(value, from_unit, to_unit)
         else:
-            if unit_type not in conversions:
-                return {"error": f"Unknown unit type: {unit_type}"}
-            
-            unit_map = conversions[unit_type]
-            if from_unit not in unit_map or to_unit not in unit_map:
+            ratio = UNIT_RATIOS.get((unit_type, from_unit, to_unit))
+            if ratio is None:
+                if unit_type not in UNIT_CONVERSIONS:
+                    return {"error": f"Unknown unit type: {unit_type}"}
                 return {"error": f"Unknown unit for {unit_type}"}
             
-            # Convert to base unit, then to target unit
-            base_value = value * unit_map[from_unit]
-            result = base_value / unit_map[to_unit]
+            result = value * ratio
         
         return {
             "original_value": value,
@@ -210,21 +286,16 @@ def unit_converter_tool(value: float, from_unit: str, to_unit: str, unit_type: s
 
 def convert_temperature(value: float, from_unit: str, to_unit: str) -> float:
     """Convert temperature between Celsius, Fahrenheit, and Kelvin"""
-    # Convert to Celsius first
-    if from_unit.lower() == "fahrenheit":
-        celsius = (value - 32) * 5/9
-    elif from_unit.lower() == "kelvin":
-        celsius = value - 273.15
-    else:  # Celsius
-        celsius = value
-    
-    # Convert from Celsius to target
-    if to_unit.lower() == "fahrenheit":
-        return celsius * 9/5 + 32
-    elif to_unit.lower() == "kelvin":
-        return celsius + 273.15
-    else:  # Celsius
-        return celsius
+    from_unit = from_unit.lower()
+    to_unit = to_unit.lower()
+    convert = TEMPERATURE_CONVERSIONS.get((from_unit, to_unit))
+    if convert is None:
+        # Unrecognised units are treated as Celsius
+        convert = TEMPERATURE_CONVERSIONS[(
+            from_unit if from_unit in _TO_CELSIUS else "celsius",
+            to_unit if to_unit in _FROM_CELSIUS else "celsius"
+        )]
+    return convert(value)
 
 # Tool registry for easy access
 CUSTOM_TOOLS = {